@@ -1,6 +1,9 @@
 from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
-from engine import CredTechEngine
+from engine import CredTechEngine, RESULT_FIELDS, SCORE_FIELDS, NEWS_SCORE_FIELDS, MACRO_SCORE_FIELDS
+from cache import SharedCache, DEFAULT_CACHE_PATH
+import base64
+import json
 import logging
 import os
 from dotenv import load_dotenv
@@ -20,6 +23,182 @@ logger = logging.getLogger(__name__)
 engine = CredTechEngine()
 engine.fred_api_key = os.getenv('FRED_API_KEY')
 
+# Shared cache so all gunicorn workers reuse each other's fetches
+if os.getenv('CACHE_ENABLED', 'True').lower() == 'true':
+    try:
+        engine.cache = SharedCache(
+            path=os.getenv('CACHE_PATH', DEFAULT_CACHE_PATH),
+            default_ttl=int(os.getenv('CACHE_TTL', '300')),
+            max_bytes=int(os.getenv('CACHE_MAX_MB', '64')) * 1024 * 1024
+        )
+    except Exception as e:
+        # A cache that cannot be set up only disables caching, never the app
+        logger.error(f"Shared cache disabled: {e}")
+
+# -------------------------
+# Response Shaping
+# -------------------------
+
+MAX_PAGE_SIZE = 100
+
+# Sortable fields whose values are strings; all others are numbers
+STRING_SORT_FIELDS = {"ticker", "timestamp", "score.risk_level", "score.alert"}
+
+def _parse_view_params(args, paginate=True):
+    """
+    Parse sparse fieldset, sorting and pagination query parameters
+    
+    fields=score.score,score.risk_level  select result fields (ticker is always kept)
+    news=true|false                       include or exclude news items
+    sort=score.score | -score.score       sort by a field, '-' for descending
+    limit=N&cursor=...                    cursor pagination
+    
+    With paginate=False (single results) sort, limit and cursor are rejected.
+    Raises ValueError on invalid parameters.
+    """
+    if not paginate:
+        for name in ('sort', 'limit', 'cursor'):
+            if name in args:
+                raise ValueError(f"'{name}' is not supported on this endpoint")
+    
+    fields = None
+    if args.get('fields'):
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+        for field in fields:
+            _validate_field(field)
+    
+    news = args.get('news')
+    if news is None:
+        include_news = fields is None or 'news' in fields
+    elif news.lower() in ('true', 'false'):
+        include_news = news.lower() == 'true'
+    else:
+        raise ValueError("'news' must be true or false")
+    
+    sort = args.get('sort')
+    descending = False
+    if sort:
+        descending = sort.startswith('-')
+        sort = sort.lstrip('-')
+        _validate_field(sort)
+        if sort in ('score', 'news'):
+            raise ValueError(f"Cannot sort by '{sort}'")
+    
+    limit = None
+    if args.get('limit'):
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError("'limit' must be an integer")
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+    
+    if args.get('cursor') and not (sort or limit):
+        raise ValueError("'cursor' requires 'sort' or 'limit'")
+    
+    return {
+        "fields": fields,
+        "include_news": include_news,
+        "sort": sort or ('ticker' if limit else None),
+        "descending": descending,
+        "limit": limit,
+        "cursor": args.get('cursor')
+    }
+
+def _validate_field(field):
+    if field in RESULT_FIELDS:
+        return
+    parent, _, child = field.partition('.')
+    if parent == 'score' and child in SCORE_FIELDS:
+        return
+    raise ValueError(f"Unknown field '{field}'")
+
+def _required_inputs(view):
+    """Return (need_news, need_macro) for the fields a view reads"""
+    paths = list(view["fields"] or ['score'])
+    if view["sort"]:
+        paths.append(view["sort"])
+    
+    score_fields = set()
+    for path in paths:
+        if path == 'score':
+            score_fields.update(SCORE_FIELDS)
+        elif path.startswith('score.'):
+            score_fields.add(path.split('.', 1)[1])
+    
+    need_news = view["include_news"] or bool(score_fields & NEWS_SCORE_FIELDS)
+    need_macro = bool(score_fields & MACRO_SCORE_FIELDS)
+    return need_news, need_macro
+
+def _project(result, view):
+    """Keep only the requested fields of a ticker result"""
+    if view["fields"] is None:
+        projected = dict(result)
+        if not view["include_news"]:
+            projected.pop("news", None)
+        return projected
+    
+    projected = {"ticker": result["ticker"]}
+    for field in view["fields"]:
+        if '.' in field:
+            parent, child = field.split('.', 1)
+            projected.setdefault(parent, {})[child] = result[parent][child]
+        elif field != 'news':
+            projected[field] = result[field]
+    if view["include_news"]:
+        projected["news"] = result["news"]
+    return projected
+
+def _sort_key(result, path):
+    value = result
+    for part in path.split('.'):
+        value = value[part]
+    return [value, result["ticker"]]
+
+def _encode_cursor(sort, descending, key):
+    payload = json.dumps({"sort": sort, "descending": descending, "after": key}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def _decode_cursor(cursor, sort, descending):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        after = payload["after"]
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get("sort") != sort or payload.get("descending") is not descending:
+        raise ValueError("Cursor does not match the requested sort")
+    if not isinstance(after, list) or len(after) != 2 or not isinstance(after[1], str):
+        raise ValueError("Invalid cursor")
+    if sort in STRING_SORT_FIELDS:
+        valid_value = isinstance(after[0], str)
+    else:
+        valid_value = isinstance(after[0], (int, float)) and not isinstance(after[0], bool)
+    if not valid_value:
+        raise ValueError("Invalid cursor")
+    return after
+
+def _paginate(results, view):
+    """Sort results and return (page, next_cursor)"""
+    sort = view["sort"]
+    if not sort:
+        return results, None
+    
+    results = sorted(results, key=lambda r: _sort_key(r, sort), reverse=view["descending"])
+    
+    if view["cursor"]:
+        after = _decode_cursor(view["cursor"], sort, view["descending"])
+        if view["descending"]:
+            results = [r for r in results if _sort_key(r, sort) < after]
+        else:
+            results = [r for r in results if _sort_key(r, sort) > after]
+    
+    limit = view["limit"]
+    if limit is None or len(results) <= limit:
+        return results, None
+    
+    page = results[:limit]
+    return page, _encode_cursor(sort, view["descending"], _sort_key(page[-1], sort))
+
 # -------------------------
 # Routes
 # -------------------------
@@ -39,6 +218,12 @@ def analyze():
         "tickers": ["AAPL", "MSFT", "TSLA"]
     }
     
+    Query parameters (all optional):
+        fields=score.score,score.risk_level
+        news=true|false
+        sort=-score.score
+        limit=5&cursor=<next_cursor>
+    
     Returns:
     {
         "status": "success",
@@ -50,10 +235,13 @@ def analyze():
                 "current_price": 150.25,
                 "timestamp": "2026-02-03T..."
             }
-        ]
+        ],
+        "count": 1,
+        "next_cursor": null
     }
     """
     try:
+        view = _parse_view_params(request.args)
         data = request.get_json()
         if not data or 'tickers' not in data:
             return jsonify({
@@ -74,15 +262,24 @@ def analyze():
         if len(tickers) > 10:
             tickers = tickers[:10]
         
-        # Analyze
-        results = engine.analyze_multiple_tickers(tickers)
+        # Analyze, skipping fetches the requested fields do not need
+        need_news, need_macro = _required_inputs(view)
+        results = engine.analyze_multiple_tickers(tickers, need_news, need_macro)
+        page, next_cursor = _paginate(results, view)
+        page = [_project(result, view) for result in page]
         
         return jsonify({
             "status": "success",
-            "data": results,
-            "count": len(results)
+            "data": page,
+            "count": len(page),
+            "next_cursor": next_cursor
         })
     
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error in /api/analyze: {e}")
         return jsonify({
@@ -95,6 +292,10 @@ def analyze_single(ticker):
     """
     Analyze a single ticker
     
+    Query parameters (all optional):
+        fields=score.score,score.risk_level
+        news=true|false
+    
     Returns:
     {
         "status": "success",
@@ -109,7 +310,9 @@ def analyze_single(ticker):
                 "message": "Invalid ticker format"
             }), 400
         
-        results = engine.analyze_multiple_tickers([ticker])
+        view = _parse_view_params(request.args, paginate=False)
+        need_news, need_macro = _required_inputs(view)
+        results = engine.analyze_multiple_tickers([ticker], need_news, need_macro)
         
         if not results:
             return jsonify({
@@ -119,9 +322,14 @@ def analyze_single(ticker):
         
         return jsonify({
             "status": "success",
-            "data": results[0]
+            "data": _project(results[0], view)
         })
     
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error in /api/ticker/{ticker}: {e}")
         return jsonify({
@@ -129,6 +337,91 @@ def analyze_single(ticker):
             "message": str(e)
         }), 500
 
+@app.route('/api/sensitivity', methods=['POST'])
+def sensitivity():
+    """
+    What-if sensitivity analysis over the scoring weights
+    
+    Request body:
+    {
+        "tickers": ["AAPL", "MSFT", "TSLA"],
+        "grid": {
+            "sentiment_weight": [10, 20, 30, 40],
+            "high_threshold": [60, 65, 70, 75]
+        }
+    }
+    
+    Grid keys are scoring parameters (price_weight, price_cap,
+    sentiment_weight, macro_weight, volatility_threshold, volatility_weight,
+    high_threshold, medium_threshold); omitted ones keep their defaults.
+    
+    Returns:
+    {
+        "status": "success",
+        "data": {
+            "parameters": {...},
+            "combinations": 16,
+            "tickers": [
+                {
+                    "ticker": "AAPL",
+                    "baseline": {"score": 62.4, "risk_level": "Medium"},
+                    "score": {"min": ..., "max": ..., "mean": ..., "std": ...},
+                    "risk_levels": {"Low": 0.0, "Medium": 0.75, "High": 0.25},
+                    "risk_level_change_rate": 0.25,
+                    "min_params": {...},
+                    "max_params": {...},
+                    "marginals": {"sentiment_weight": [...], "high_threshold": [...]},
+                    "risk_level_marginals": {"high_threshold": {"Low": [...], "Medium": [...], "High": [...]}},
+                    "risk_level_change_marginals": {"high_threshold": [...]}
+                }
+            ],
+            "skipped": []
+        }
+    }
+    
+    Tickers not yet in the cache are fetched upstream, at most 10 per
+    request; the rest are listed in "skipped" and can be retried once
+    warmed (e.g. via /api/analyze). Without the shared cache, more than
+    10 tickers is a 400.
+    """
+    try:
+        data = request.get_json()
+        if not data or 'tickers' not in data or 'grid' not in data:
+            return jsonify({
+                "status": "error",
+                "message": "Request must contain 'tickers' array and 'grid' object"
+            }), 400
+        
+        tickers = data.get('tickers', [])
+        if not isinstance(tickers, list) or len(tickers) == 0:
+            return jsonify({
+                "status": "error",
+                "message": "Tickers must be a non-empty array"
+            }), 400
+        
+        # Limit to a 100 ticker watchlist per request
+        if len(tickers) > 100:
+            tickers = tickers[:100]
+        
+        result = engine.sensitivity_analysis(tickers, data['grid'])
+        
+        return jsonify({
+            "status": "success",
+            "data": result
+        })
+    
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in /api/sensitivity: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
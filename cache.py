@@ -0,0 +1,278 @@
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Private to the app: never a shared, world-writable location like /tmp
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance")
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "credtech_cache.sqlite3")
+
+
+class SharedCache:
+    """
+    Process-shared key/value cache backed by a local SQLite file
+
+    All gunicorn workers on a host open the same file, so a value fetched by
+    one worker is visible to the others. WAL mode lets readers proceed while a
+    writer commits, every write runs in its own transaction, entries expire
+    after a TTL and the total stored size is capped by evicting the oldest
+    entries first. Concurrent misses on the same key are coalesced: one
+    worker takes a short lease and loads the value while the others wait.
+
+    Values are stored as JSON (DataFrames via to_json), never pickled, so the
+    file cannot be used to run code. The cache directory is created with mode
+    0700 and must be owned by the current user.
+
+    Cache errors are logged and treated as misses so a broken cache file never
+    takes down a request.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, default_ttl=300, max_bytes=64 * 1024 * 1024,
+                 lease_ttl=30, poll_interval=0.1):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._ensure_private_dir(os.path.dirname(os.path.abspath(path)))
+        self._init_schema()
+
+    @staticmethod
+    def _ensure_private_dir(directory):
+        """Create the cache directory as 0700 and refuse one others can write to"""
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Ownership and mode bits are only meaningful on POSIX
+        if not hasattr(os, "geteuid"):
+            return
+        st = os.stat(directory)
+        if st.st_uid != os.geteuid() or st.st_mode & 0o022:
+            raise PermissionError(
+                f"Cache directory {directory} must be owned by the current user and not group/world-writable"
+            )
+
+    def _connect(self):
+        """Return a connection owned by the current process and thread"""
+        # Connections must not cross a fork (gunicorn --preload) or threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        try:
+            conn = self._connect()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    format TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_leases (
+                    key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error initialising cache at {self.path}: {e}")
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, pd.DataFrame):
+            return "dataframe", json.dumps({
+                "dtypes": {str(col): str(dtype) for col, dtype in value.dtypes.items()},
+                "frame": value.to_json(orient="split", date_format="iso", double_precision=15)
+            })
+        return "json", json.dumps(value)
+
+    @staticmethod
+    def _decode(fmt, text):
+        if fmt == "dataframe":
+            # Restore the stored dtypes instead of re-inferring them, so a hit
+            # scores exactly like a fresh fetch
+            payload = json.loads(text)
+            frame = pd.read_json(io.StringIO(payload["frame"]), orient="split", dtype=False, convert_axes=True)
+            return frame.astype({col: payload["dtypes"][str(col)] for col in frame.columns})
+        if fmt == "json":
+            return json.loads(text)
+        raise ValueError(f"Unknown cache format '{fmt}'")
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        try:
+            row = self._connect().execute(
+                "SELECT format, value FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading cache key {key}: {e}")
+            return None
+
+        if row is None:
+            return None
+        try:
+            return self._decode(*row)
+        except Exception as e:
+            # Unreadable entries are misses; drop them so the next load refreshes
+            logger.error(f"Error decoding cache key {key}: {e}")
+            self.delete(key)
+            return None
+
+    def contains(self, key):
+        """Return True if an unexpired entry exists for key, without decoding it"""
+        try:
+            row = self._connect().execute(
+                "SELECT 1 FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error as e:
+            logger.error(f"Error reading cache key {key}: {e}")
+            return False
+
+    def set(self, key, value, ttl=None):
+        """Store value under key and enforce expiry and the size cap atomically"""
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            fmt, text = self._encode(value)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error serialising cache key {key}: {e}")
+            return
+
+        size = len(text.encode())
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, format, value, size, stored_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, fmt, text, size, now, now + ttl)
+                )
+                conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+                # Drop the oldest entries once the running total passes the cap
+                conn.execute(
+                    """
+                    DELETE FROM cache_entries WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY stored_at DESC, key) AS running
+                            FROM cache_entries
+                        ) WHERE running > ?
+                    )
+                    """,
+                    (self.max_bytes,)
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Error writing cache key {key}: {e}")
+
+    def _acquire_lease(self, key, owner):
+        """Try to take the load lease for key; True if this caller now holds it"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT owner FROM cache_leases WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache_leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                        (key, owner, now + self.lease_ttl)
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            return row is None
+        except sqlite3.Error as e:
+            # Without a working lease table, load uncoordinated
+            logger.error(f"Error acquiring cache lease for {key}: {e}")
+            return True
+
+    def _release_lease(self, key, owner):
+        try:
+            self._connect().execute(
+                "DELETE FROM cache_leases WHERE key = ? AND owner = ?",
+                (key, owner)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error releasing cache lease for {key}: {e}")
+
+    def get_or_set(self, key, loader, ttl=None):
+        """
+        Return the cached value for key, calling loader() on a miss
+
+        Only one process loads a given key at a time; the others poll for the
+        value until the lease is released or expires, then take it over.
+        None results from the loader are returned but never cached, so a
+        failed upstream fetch is retried on the next request.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        owner = f"{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex}"
+        deadline = time.time() + self.lease_ttl
+        while not self._acquire_lease(key, owner):
+            if time.time() >= deadline:
+                # Lease holder is stuck; load without it rather than block
+                owner = None
+                break
+            time.sleep(self.poll_interval)
+            value = self.get(key)
+            if value is not None:
+                return value
+
+        try:
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            if owner is not None:
+                self._release_lease(key, owner)
+
+    def delete(self, key):
+        """Remove a single key"""
+        try:
+            self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting cache key {key}: {e}")
+
+    def clear(self):
+        """Remove every entry"""
+        try:
+            self._connect().execute("DELETE FROM cache_entries")
+        except sqlite3.Error as e:
+            logger.error(f"Error clearing cache: {e}")
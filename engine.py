@@ -12,38 +12,101 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields of a ticker result and of its score breakdown
+RESULT_FIELDS = ["ticker", "score", "news", "current_price", "timestamp"]
+SCORE_FIELDS = [
+    "score", "price_contribution", "sentiment_contribution", "macro_contribution",
+    "volatility_penalty", "daily_change", "avg_sentiment", "price_change_30d",
+    "risk_level", "alert"
+]
+
+# Score fields that depend on news sentiment or on macro data
+NEWS_SCORE_FIELDS = {"score", "sentiment_contribution", "avg_sentiment", "risk_level"}
+MACRO_SCORE_FIELDS = {"score", "macro_contribution", "risk_level"}
+
+# Default scoring model parameters
+SCORING_PARAMS = {
+    "price_weight": 100,           # points per unit of 30d price change
+    "price_cap": 50,               # price contribution clipped to +/- this
+    "sentiment_weight": 30,        # points per unit of average sentiment
+    "macro_weight": 15,            # points per unit of macro change (negative impact)
+    "volatility_threshold": 0.05,  # daily move that triggers the penalty
+    "volatility_weight": 10,       # penalty points per unit of daily move
+    "high_threshold": 70,          # score at or above which risk level is High
+    "medium_threshold": 40         # score at or above which risk level is Medium
+}
+
+# Upper bounds on the sensitivity grid: values per parameter and total
+# combinations (response size grows with values x tickers, compute with both)
+MAX_SENSITIVITY_VALUES = 100
+MAX_SENSITIVITY_COMBINATIONS = 10000
+
+# Upper bound on tickers fetched upstream (not already cached) per sensitivity request
+MAX_SENSITIVITY_COLD_FETCHES = 10
+
 class CredTechEngine:
     """Core engine for credit intelligence calculations"""
     
     def __init__(self):
         self.analyzer = SentimentIntensityAnalyzer()
         self.fred_api_key = None  # Set via environment variable
+        self.cache = None  # Optional SharedCache, shared across worker processes
         
+    def _cached(self, key, loader, ttl=None):
+        """Run loader through the shared cache when one is configured"""
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_set(key, loader, ttl)
+
+    def _cached_if_complete(self, key, loader, ttl=None):
+        """
+        Like _cached for loaders returning (value, complete)
+        
+        Values built from a failed upstream fetch are returned but not cached.
+        """
+        if self.cache is not None:
+            value = self.cache.get(key)
+            if value is not None:
+                return value
+        
+        value, complete = loader()
+        if value is not None and complete and self.cache is not None:
+            self.cache.set(key, value, ttl)
+        return value
+
     def fetch_fred_series(self, series_id="FEDFUNDS"):
         """Fetch macroeconomic data from FRED API"""
+        macro_data = self._fetch_fred_or_none(series_id)
+        return macro_data if macro_data is not None else pd.DataFrame(columns=["date", "value"])
+
+    def _fetch_fred_or_none(self, series_id="FEDFUNDS"):
+        """Fetch FRED data, returning None instead of an empty frame when the fetch failed"""
         try:
             if not self.fred_api_key:
                 logger.warning("FRED API key not set, returning empty data")
                 return pd.DataFrame(columns=["date", "value"])
             
-            url = f"https://api.stlouisfed.org/fred/series/observations?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
-            r = requests.get(url, timeout=10)
-            r.raise_for_status()
-            
-            data = r.json()
-            if "observations" not in data:
-                return pd.DataFrame(columns=["date", "value"])
-            
-            df = pd.DataFrame(data["observations"])
-            df["value"] = pd.to_numeric(df["value"], errors='coerce')
-            df["date"] = pd.to_datetime(df["date"])
-            return df[["date", "value"]].dropna()
+            return self._cached(f"fred:{series_id}", lambda: self._load_fred_series(series_id))
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching FRED data: {e}")
-            return pd.DataFrame(columns=["date", "value"])
+            return None
         except Exception as e:
             logger.error(f"Unexpected error in fetch_fred_series: {e}")
+            return None
+
+    def _load_fred_series(self, series_id):
+        url = f"https://api.stlouisfed.org/fred/series/observations?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
+        r = requests.get(url, timeout=10)
+        r.raise_for_status()
+        
+        data = r.json()
+        if "observations" not in data:
             return pd.DataFrame(columns=["date", "value"])
+        
+        df = pd.DataFrame(data["observations"])
+        df["value"] = pd.to_numeric(df["value"], errors='coerce')
+        df["date"] = pd.to_datetime(df["date"])
+        return df[["date", "value"]].dropna()
 
     def classify_event(self, title):
         """Classify news events by risk level"""
@@ -60,9 +123,9 @@ class CredTechEngine:
 
     def score_color(self, score):
         """Get risk level based on score"""
-        if score >= 70:
+        if score >= SCORING_PARAMS["high_threshold"]:
             return "High"
-        elif score >= 40:
+        elif score >= SCORING_PARAMS["medium_threshold"]:
             return "Medium"
         else:
             return "Low"
@@ -70,38 +133,56 @@ class CredTechEngine:
     def fetch_stock_data(self, ticker, period="30d"):
         """Fetch stock data from yfinance"""
         try:
-            data = yf.download(ticker, period=period, interval="1d", progress=False)
-            if data.empty or len(data) < 2:
-                return None
-            return data
+            return self._cached(f"stock:{ticker}:{period}", lambda: self._load_stock_data(ticker, period))
         except Exception as e:
             logger.error(f"Error fetching stock data for {ticker}: {e}")
             return None
 
     def fetch_news(self, ticker):
         """Fetch news and sentiment for a ticker"""
+        news_data = self._fetch_news_or_none(ticker)
+        return news_data if news_data is not None else []
+
+    def _fetch_news_or_none(self, ticker):
+        """Fetch news, returning None instead of [] when the feed could not be read"""
         try:
-            rss_url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
-            feed = feedparser.parse(rss_url)
-            
-            news_list = []
-            for entry in feed.entries[:5]:
-                title = entry.get("title", "Unknown Title")
-                score = self.analyzer.polarity_scores(title)["compound"]
-                event = self.classify_event(title)
-                published = entry.get("published", datetime.now().isoformat())
-                
-                news_list.append({
-                    "title": title,
-                    "sentiment_score": float(score),
-                    "event_type": event,
-                    "published": str(published)
-                })
-            
-            return news_list
+            return self._cached(f"news:{ticker}", lambda: self._load_news(ticker))
         except Exception as e:
             logger.error(f"Error fetching news for {ticker}: {e}")
-            return []
+            return None
+
+    def _load_stock_data(self, ticker, period):
+        data = yf.download(ticker, period=period, interval="1d", progress=False)
+        if data.empty or len(data) < 2:
+            return None
+        # Single-ticker downloads may carry a (field, ticker) column index
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return data
+
+    def _load_news(self, ticker):
+        rss_url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
+        feed = feedparser.parse(rss_url)
+        # feedparser does not raise on network/HTTP errors, it flags bozo
+        if feed.bozo and not feed.entries:
+            logger.warning(f"Could not read news feed for {ticker}: {feed.get('bozo_exception')}")
+            return None
+        
+        news_list = []
+        for entry in feed.entries[:5]:
+            title = entry.get("title", "Unknown Title")
+            score = self.analyzer.polarity_scores(title)["compound"]
+            event = self.classify_event(title)
+            published = entry.get("published", datetime.now().isoformat())
+            
+            news_list.append({
+                "title": title,
+                "sentiment_score": float(score),
+                "event_type": event,
+                "published": str(published)
+            })
+        
+        return news_list
 
     def calculate_credit_score(self, ticker, stock_data=None, news_data=None, macro_data=None):
         """
@@ -124,38 +205,27 @@ class CredTechEngine:
             if stock_data is None:
                 return None
             
+            params = SCORING_PARAMS
+            inputs = self._score_inputs(stock_data, news_data)
+            price_change = inputs["price_change"]
+            avg_sentiment = inputs["avg_sentiment"]
+            daily_change = inputs["daily_change"]
+            
             # 1. Stock Price Contribution (0-100 scale)
-            price_current = stock_data["Close"].iloc[-1].item() if hasattr(stock_data["Close"].iloc[-1], 'item') else float(stock_data["Close"].iloc[-1])
-            price_initial = stock_data["Close"].iloc[0].item() if hasattr(stock_data["Close"].iloc[0], 'item') else float(stock_data["Close"].iloc[0])
-            price_change = (price_current - price_initial) / price_initial
-            price_contribution = np.clip(price_change * 100, -50, 50)
+            price_contribution = np.clip(price_change * params["price_weight"], -params["price_cap"], params["price_cap"])
             
             # 2. News Sentiment Contribution
-            if news_data and len(news_data) > 0:
-                avg_sentiment = np.mean([n["sentiment_score"] for n in news_data])
-                sentiment_contribution = avg_sentiment * 30  # Sentiment worth 30 points
-            else:
-                avg_sentiment = 0
-                sentiment_contribution = 0
+            sentiment_contribution = avg_sentiment * params["sentiment_weight"]
             
-            # 3. Macro Factor Contribution
-            macro_contribution = 0
-            if isinstance(macro_data, pd.DataFrame) and len(macro_data) > 0:
-                try:
-                    if len(macro_data) > 1:
-                        first_val = macro_data["value"].iloc[0]
-                        last_val = macro_data["value"].iloc[-1]
-                        if first_val != 0 and pd.notna(first_val) and pd.notna(last_val):
-                            macro_change = (last_val - first_val) / first_val
-                            macro_contribution = -macro_change * 15  # Negative macro impact
-                except (ZeroDivisionError, ValueError, TypeError):
-                    macro_contribution = 0
+            # 3. Macro Factor Contribution (negative macro impact)
+            macro_change = self._macro_change(macro_data)
+            macro_contribution = -(macro_change * params["macro_weight"]) if macro_change else 0.0
             
             # 4. Daily volatility metric
-            close_price_current = stock_data["Close"].iloc[-1].item() if hasattr(stock_data["Close"].iloc[-1], 'item') else float(stock_data["Close"].iloc[-1])
-            close_price_prev = stock_data["Close"].iloc[-2].item() if hasattr(stock_data["Close"].iloc[-2], 'item') else float(stock_data["Close"].iloc[-2])
-            daily_change = (close_price_current - close_price_prev) / close_price_prev
-            volatility_penalty = abs(daily_change) * 10 if abs(daily_change) > 0.05 else 0
+            if abs(daily_change) > params["volatility_threshold"]:
+                volatility_penalty = abs(daily_change) * params["volatility_weight"]
+            else:
+                volatility_penalty = 0
             
             # Base score with weighted components
             base_score = 50
@@ -174,16 +244,51 @@ class CredTechEngine:
                 "avg_sentiment": float(round(avg_sentiment, 4)),
                 "price_change_30d": float(round(price_change * 100, 2)),
                 "risk_level": self.score_color(score),
-                "alert": "🔴" if abs(daily_change) > 0.05 else ""
+                "alert": "🔴" if abs(daily_change) > params["volatility_threshold"] else ""
             }
         except Exception as e:
             logger.error(f"Error calculating credit score for {ticker}: {e}")
             return None
 
-    def analyze_multiple_tickers(self, tickers):
+    def _score_inputs(self, stock_data, news_data):
+        """Extract the raw per-ticker factors the scoring model weights"""
+        closes = stock_data["Close"]
+        price_current = closes.iloc[-1].item() if hasattr(closes.iloc[-1], 'item') else float(closes.iloc[-1])
+        price_initial = closes.iloc[0].item() if hasattr(closes.iloc[0], 'item') else float(closes.iloc[0])
+        price_prev = closes.iloc[-2].item() if hasattr(closes.iloc[-2], 'item') else float(closes.iloc[-2])
+        
+        if news_data and len(news_data) > 0:
+            avg_sentiment = float(np.mean([n["sentiment_score"] for n in news_data]))
+        else:
+            avg_sentiment = 0.0
+        
+        return {
+            "price_change": (price_current - price_initial) / price_initial,
+            "avg_sentiment": avg_sentiment,
+            "daily_change": (price_current - price_prev) / price_prev
+        }
+
+    def _macro_change(self, macro_data):
+        """Relative change over the macro series, 0 when unavailable"""
+        if not isinstance(macro_data, pd.DataFrame) or len(macro_data) < 2:
+            return 0.0
+        try:
+            first_val = macro_data["value"].iloc[0]
+            last_val = macro_data["value"].iloc[-1]
+            if first_val != 0 and pd.notna(first_val) and pd.notna(last_val):
+                return float((last_val - first_val) / first_val)
+        except (ZeroDivisionError, ValueError, TypeError):
+            pass
+        return 0.0
+
+    def analyze_multiple_tickers(self, tickers, need_news=True, need_macro=True):
         """
         Analyze multiple tickers and return comprehensive results
         
+        need_news=False skips the RSS fetch and need_macro=False skips FRED;
+        the score fields that depend on them are then computed without them
+        and should not be returned to the caller.
+        
         BUG FIXES:
         1. Removed uncaught exception handling
         2. Added validation for empty ticker list
@@ -194,7 +299,8 @@ class CredTechEngine:
             return []
         
         # Fetch macro data once
-        macro_data = self.fetch_fred_series()
+        macro_data = self._fetch_fred_or_none() if need_macro else None
+        macro_complete = macro_data is not None or not need_macro
         
         results = []
         for ticker in tickers:
@@ -203,27 +309,13 @@ class CredTechEngine:
                 if not ticker:
                     continue
                 
-                # Fetch data
-                stock_data = self.fetch_stock_data(ticker)
-                if stock_data is None:
-                    logger.warning(f"No data available for {ticker}")
-                    continue
-                
-                news_data = self.fetch_news(ticker)
-                
-                # Calculate score
-                score_result = self.calculate_credit_score(ticker, stock_data, news_data, macro_data)
-                if score_result is None:
+                # Reuse a result computed by any worker within the cache TTL
+                result = self._cached_if_complete(
+                    f"result:{ticker}:{int(need_news)}{int(need_macro)}",
+                    lambda: self._analyze_ticker(ticker, macro_data, need_news, macro_complete)
+                )
+                if result is None:
                     continue
-                
-                # Compile result
-                result = {
-                    "ticker": ticker,
-                    "score": score_result,
-                    "news": news_data,
-                    "current_price": stock_data["Close"].iloc[-1].item() if hasattr(stock_data["Close"].iloc[-1], 'item') else float(stock_data["Close"].iloc[-1]),
-                    "timestamp": datetime.now().isoformat()
-                }
                 results.append(result)
                 
             except Exception as e:
@@ -232,5 +324,218 @@ class CredTechEngine:
         
         return results
 
+    def _analyze_ticker(self, ticker, macro_data, need_news=True, macro_complete=True):
+        """
+        Fetch data and compile the full result for one ticker, as (result, complete)
+        
+        complete is False when news or macro data was needed but could not be
+        fetched, so the result is not cached.
+        """
+        # Fetch data
+        stock_data = self.fetch_stock_data(ticker)
+        if stock_data is None:
+            logger.warning(f"No data available for {ticker}")
+            return None, False
+        
+        news_data = self._fetch_news_or_none(ticker) if need_news else []
+        complete = news_data is not None and macro_complete
+        if news_data is None:
+            news_data = []
+        
+        # Calculate score
+        score_result = self.calculate_credit_score(ticker, stock_data, news_data, macro_data)
+        if score_result is None:
+            return None, False
+        
+        # Compile result
+        result = {
+            "ticker": ticker,
+            "score": score_result,
+            "news": news_data,
+            "current_price": stock_data["Close"].iloc[-1].item() if hasattr(stock_data["Close"].iloc[-1], 'item') else float(stock_data["Close"].iloc[-1]),
+            "timestamp": datetime.now().isoformat()
+        }
+        return result, complete
+
+    def sensitivity_analysis(self, tickers, grid):
+        """
+        Recompute scores for every combination of scoring parameters
+        
+        grid maps SCORING_PARAMS names to lists of values; parameters not in
+        the grid keep their default. Per-ticker inputs are fetched once
+        (through the shared cache) and all combinations are scored in a single
+        vectorized pass. Raises ValueError for an invalid grid.
+        
+        At most MAX_SENSITIVITY_COLD_FETCHES tickers that are not cached yet
+        are fetched upstream; the rest are listed under "skipped" so the
+        request does not block on a long run of sequential fetches. Without
+        the shared cache nothing can be warmed, so larger watchlists are
+        rejected with ValueError instead.
+        """
+        names, values = self._parse_grid(grid)
+        
+        if self.cache is None:
+            valid = {t.strip().upper() for t in tickers if isinstance(t, str) and t.strip()}
+            if len(valid) > MAX_SENSITIVITY_COLD_FETCHES:
+                raise ValueError(
+                    f"Sensitivity analysis over more than {MAX_SENSITIVITY_COLD_FETCHES} tickers "
+                    f"requires the shared cache (CACHE_ENABLED)"
+                )
+        
+        macro_change = self._macro_change(self.fetch_fred_series())
+        
+        tickers_ok = []
+        inputs = []
+        skipped = []
+        cold_fetches = 0
+        for ticker in tickers:
+            if not isinstance(ticker, str):
+                logger.warning(f"Skipping invalid ticker {ticker!r}")
+                continue
+            ticker = ticker.strip().upper()
+            if not ticker:
+                continue
+            if not self._inputs_cached(ticker):
+                if cold_fetches >= MAX_SENSITIVITY_COLD_FETCHES:
+                    skipped.append(ticker)
+                    continue
+                cold_fetches += 1
+            ticker_inputs = self._cached_if_complete(f"inputs:{ticker}", lambda: self._load_score_inputs(ticker))
+            if ticker_inputs is None:
+                logger.warning(f"No data available for {ticker}")
+                continue
+            tickers_ok.append(ticker)
+            inputs.append(ticker_inputs)
+        
+        if not inputs:
+            return {"parameters": dict(zip(names, values)), "combinations": 0, "tickers": [], "skipped": skipped}
+        
+        # Ticker inputs as row vectors (1, T)
+        price_change = np.array([i["price_change"] for i in inputs])[None, :]
+        avg_sentiment = np.array([i["avg_sentiment"] for i in inputs])[None, :]
+        abs_daily = np.abs(np.array([i["daily_change"] for i in inputs]))[None, :]
+        
+        # Every parameter combination as column vectors (C, 1)
+        mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in values], indexing="ij")
+        params = dict(SCORING_PARAMS)
+        for name, axis in zip(names, mesh):
+            params[name] = axis.reshape(-1, 1)
+        
+        # Scores and risk bands (0=Low, 1=Medium, 2=High) with shape (C, T)
+        scores, bands = self._vectorized_scores(price_change, avg_sentiment, abs_daily, macro_change, params)
+        scores = np.broadcast_to(scores, (mesh[0].size, len(tickers_ok)))
+        baseline_scores, baseline_bands = self._vectorized_scores(price_change, avg_sentiment, abs_daily, macro_change, SCORING_PARAMS)
+        
+        # Per-parameter marginals over grid values, each with shape (values, T):
+        # mean score, share of combinations in each band, band change rate
+        grid_shape = mesh[0].shape + (len(tickers_ok),)
+        grid_scores = scores.reshape(grid_shape)
+        grid_bands = bands.reshape(grid_shape)
+        band_changed = grid_bands != baseline_bands[0]
+        marginals, band_marginals, change_marginals = {}, {}, {}
+        for axis, name in enumerate(names):
+            other_axes = tuple(i for i in range(len(names)) if i != axis)
+            marginals[name] = grid_scores.mean(axis=other_axes)
+            band_marginals[name] = [(grid_bands == b).mean(axis=other_axes) for b in range(3)]
+            change_marginals[name] = band_changed.mean(axis=other_axes)
+        
+        band_names = np.array(["Low", "Medium", "High"])
+        results = []
+        for t, ticker in enumerate(tickers_ok):
+            column = scores[:, t]
+            band_column = bands[:, t]
+            band_counts = np.bincount(band_column, minlength=3) / column.size
+            results.append({
+                "ticker": ticker,
+                "baseline": {
+                    "score": float(round(baseline_scores[0, t], 2)),
+                    "risk_level": str(band_names[baseline_bands[0, t]])
+                },
+                "score": {
+                    "min": float(round(column.min(), 2)),
+                    "max": float(round(column.max(), 2)),
+                    "mean": float(round(column.mean(), 2)),
+                    "std": float(round(column.std(), 2))
+                },
+                "risk_levels": {str(band_names[b]): float(round(band_counts[b], 4)) for b in range(3)},
+                "risk_level_change_rate": float(round(np.mean(band_column != baseline_bands[0, t]), 4)),
+                "min_params": self._combination(names, mesh, int(column.argmin())),
+                "max_params": self._combination(names, mesh, int(column.argmax())),
+                "marginals": {name: np.round(marginals[name][:, t], 2).tolist() for name in names},
+                "risk_level_marginals": {
+                    name: {str(band_names[b]): np.round(band_marginals[name][b][:, t], 4).tolist() for b in range(3)}
+                    for name in names
+                },
+                "risk_level_change_marginals": {name: np.round(change_marginals[name][:, t], 4).tolist() for name in names}
+            })
+        
+        return {
+            "parameters": dict(zip(names, values)),
+            "combinations": int(mesh[0].size),
+            "tickers": results,
+            "skipped": skipped
+        }
+
+    def _parse_grid(self, grid):
+        if not isinstance(grid, dict) or len(grid) == 0:
+            raise ValueError("Grid must be a non-empty object of parameter value lists")
+        
+        names, values = [], []
+        combinations = 1
+        for name, param_values in grid.items():
+            if name not in SCORING_PARAMS:
+                raise ValueError(f"Unknown scoring parameter '{name}'")
+            if not isinstance(param_values, list) or len(param_values) == 0:
+                raise ValueError(f"Values for '{name}' must be a non-empty array")
+            if len(param_values) > MAX_SENSITIVITY_VALUES:
+                raise ValueError(f"'{name}' has {len(param_values)} values, maximum is {MAX_SENSITIVITY_VALUES}")
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in param_values):
+                raise ValueError(f"Values for '{name}' must be numbers")
+            if not np.isfinite(np.asarray(param_values, dtype=float)).all():
+                raise ValueError(f"Values for '{name}' must be finite")
+            names.append(name)
+            values.append(param_values)
+            combinations *= len(param_values)
+        
+        if combinations > MAX_SENSITIVITY_COMBINATIONS:
+            raise ValueError(f"Grid has {combinations} combinations, maximum is {MAX_SENSITIVITY_COMBINATIONS}")
+        
+        effective = {name: grid.get(name, [SCORING_PARAMS[name]]) for name in SCORING_PARAMS}
+        if min(effective["price_cap"]) < 0:
+            raise ValueError("'price_cap' must not be negative")
+        if max(effective["medium_threshold"]) > min(effective["high_threshold"]):
+            raise ValueError("'medium_threshold' must not exceed 'high_threshold' in any combination")
+        return names, values
+
+    def _inputs_cached(self, ticker):
+        """True if a ticker's score inputs can be built without an upstream fetch"""
+        if self.cache is None:
+            return False
+        if self.cache.contains(f"inputs:{ticker}"):
+            return True
+        return self.cache.contains(f"stock:{ticker}:30d") and self.cache.contains(f"news:{ticker}")
+
+    def _load_score_inputs(self, ticker):
+        stock_data = self.fetch_stock_data(ticker)
+        if stock_data is None:
+            return None, False
+        news_data = self._fetch_news_or_none(ticker)
+        return self._score_inputs(stock_data, news_data or []), news_data is not None
+
+    def _vectorized_scores(self, price_change, avg_sentiment, abs_daily, macro_change, params):
+        """Array form of calculate_credit_score; inputs and params broadcast together"""
+        price_contribution = np.clip(price_change * params["price_weight"], -params["price_cap"], params["price_cap"])
+        sentiment_contribution = avg_sentiment * params["sentiment_weight"]
+        macro_contribution = -macro_change * params["macro_weight"]
+        volatility_penalty = np.where(abs_daily > params["volatility_threshold"], abs_daily * params["volatility_weight"], 0.0)
+        
+        scores = np.clip(50 + price_contribution + sentiment_contribution + macro_contribution - volatility_penalty, 0, 100)
+        # medium_threshold <= high_threshold, so the band is the count of thresholds reached
+        bands = (scores >= params["medium_threshold"]).astype(np.int8) + (scores >= params["high_threshold"])
+        return scores, bands
+
+    def _combination(self, names, mesh, index):
+        return {name: float(axis.flat[index]) for name, axis in zip(names, mesh)}
+
 # Initialize engine
 engine = CredTechEngine()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""Check the vectorized sensitivity scores stay in step with calculate_credit_score"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from engine import CredTechEngine, SCORING_PARAMS
+
+# 30 days rising 100 -> 110, then a 7% jump so the volatility penalty applies
+STOCK = pd.DataFrame({"Close": [100 + i * 10 / 28 for i in range(29)] + [118.0]})
+NEWS = [{"sentiment_score": 0.6}, {"sentiment_score": -0.2}]
+MACRO = pd.DataFrame({"date": pd.to_datetime(["2026-01-01", "2026-02-01"]), "value": [4.0, 4.4]})
+
+# One non-default value per parameter, chosen so each one changes the score or band
+GRID_POINTS = [
+    ("price_weight", 60),
+    ("price_cap", 10),
+    ("sentiment_weight", 45),
+    ("macro_weight", 25),
+    ("volatility_threshold", 0.1),
+    ("volatility_weight", 20),
+    ("high_threshold", 55),
+    ("medium_threshold", 30),
+]
+
+
+@pytest.fixture
+def engine():
+    engine = CredTechEngine()
+    engine.fetch_stock_data = lambda ticker, period="30d": STOCK
+    engine._fetch_news_or_none = lambda ticker: NEWS
+    engine.fetch_fred_series = lambda series_id="FEDFUNDS": MACRO
+    return engine
+
+
+@pytest.mark.parametrize("name,value", [(name, SCORING_PARAMS[name]) for name, _ in GRID_POINTS] + GRID_POINTS)
+def test_single_point_grid_matches_calculate_credit_score(engine, monkeypatch, name, value):
+    monkeypatch.setitem(SCORING_PARAMS, name, value)
+    expected = engine.calculate_credit_score("TEST", STOCK, NEWS, MACRO)
+
+    result = engine.sensitivity_analysis(["TEST"], {name: [value]})
+    ticker = result["tickers"][0]
+
+    assert result["combinations"] == 1
+    assert ticker["baseline"] == {"score": expected["score"], "risk_level": expected["risk_level"]}
+    assert ticker["score"]["min"] == expected["score"]
+    assert ticker["score"]["max"] == expected["score"]
+    assert ticker["risk_levels"][expected["risk_level"]] == 1.0
+
+
+def test_missing_macro_contribution_is_positive_zero(engine):
+    score = engine.calculate_credit_score("TEST", STOCK, NEWS, pd.DataFrame(columns=["date", "value"]))
+
+    assert score["macro_contribution"] == 0.0
+    assert math.copysign(1, score["macro_contribution"]) == 1